@@ -1,4 +1,5 @@
 from sardine import *
+boot()
 
 c.bpm = 100 # change bpm
 
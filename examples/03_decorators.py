@@ -1,4 +1,5 @@
 from sardine import *
+boot()
 
 from random import choice
 from random import randint
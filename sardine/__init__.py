@@ -1,18 +1,25 @@
 from __future__ import with_statement
 import asyncio
+import ctypes
+import ctypes.util
+import os
 import pathlib
+import sys
 import warnings
-from typing import Union
+from typing import Callable, Coroutine, Union
 
 from rich import print
-from rich.console import Console
-from rich.markdown import Markdown
-try:
-    import uvloop
-except ImportError:
-    warnings.warn('uvloop is not installed, rhythm accuracy may be impacted')
-else:
-    uvloop.install()
+
+# uvloop is POSIX-only, Windows silently keeps the default event loop
+uvloop = None
+if (os.environ.get("SARDINE_EVENT_LOOP", "uvloop") == "uvloop"
+        and sys.platform != "win32"):
+    try:
+        import uvloop
+    except ImportError:
+        warnings.warn('uvloop is not installed, rhythm accuracy may be impacted')
+    else:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 from .clock.Clock import Clock
 from .superdirt.SuperDirt import SuperDirt as Sound
@@ -25,8 +32,27 @@ from .io.Osc import Client as OSC
 warnings.filterwarnings("ignore")
 
 def print_pre_alpha_todo() -> None:
-    """ Print the TODOlist from pre-alpha version """
+    """
+    Print the TODOlist from pre-alpha version. On a terminal, the list
+    pre-rendered in todo.ansi is printed as is. Regenerate it after
+    editing todo.md with:
+
+    python -c "from rich.console import Console; from rich.markdown import Markdown; \\
+    c = Console(record=True, width=80, force_terminal=True); \\
+    c.print(Markdown(open('sardine/todo.md').read())); \\
+    open('sardine/todo.ansi', 'w').write(c.export_text(styles=True))" > /dev/null
+    """
     cur_path = pathlib.Path(__file__).parent.resolve()
+    if sys.stdout.isatty():
+        try:
+            sys.stdout.write((cur_path / "todo.ansi").read_text(encoding="utf-8"))
+            return
+        except OSError:
+            pass
+
+    from rich.console import Console
+    from rich.markdown import Markdown
+
     with open("".join([str(cur_path), "/todo.md"])) as f:
         console = Console()
         console.print(Markdown(f.read()))
@@ -46,11 +72,6 @@ coding. Check the examples/ folder to learn more. :)
 """
 
 
-# Pretty printing
-print(f"[red]{sardine}[/red]")
-print_pre_alpha_todo()
-print('\n')
-
 c = Clock()
 cs = c.schedule
 cr = c.remove
@@ -59,37 +80,128 @@ S = Sound
 # Exposing some MIDI functions
 def note(delay, note: int=60, velocity: int =127, channel: int=1):
     """ Send a MIDI Note """
-    asyncio.create_task(c._midi.note(
-        clock=c, delay=delay, note=note,
-            velocity=velocity, channel=channel))
+    c._midi.note(clock=c, delay=delay, note=note,
+            velocity=velocity, channel=channel)
 
 def cc(channel: int=1, control: int=20, value: int=64):
-    asyncio.create_task(c._midi.control_change(
-        channel=channel, control=control, value=value))
-
-asyncio.create_task(c._send_start(initial=True))
-
-# Should start, doesn't start
-SC = SuperColliderProcess(
-        synth_directory=find_synth_directory(),
-        startup_file=find_startup_file())
+    """ Send a MIDI Control Change """
+    c._midi.control_change(
+        clock=c, channel=channel, control=control, value=value)
+
+# Set once the SuperColliderProcess spawned by boot() is ready
+SC: Union[SuperColliderProcess, None] = None
+
+def _spawn_sc() -> SuperColliderProcess:
+    return SuperColliderProcess(
+            synth_directory=find_synth_directory(),
+            startup_file=find_startup_file())
+
+def _set_sc(future: asyncio.Future) -> None:
+    global SC
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        print(f"[bold red]SuperCollider error: {error}[/bold red]")
+    else:
+        SC = future.result()
+
+def start_default() -> None:
+    """ Start the default clock `c` on the running event loop """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        raise RuntimeError(
+                "Sardine must be booted from a running event loop, "
+                "use the asyncio REPL or sardine.run()") from None
+    if not c.running:
+        asyncio.create_task(c._send_start(initial=True))
+
+PR_SET_TIMERSLACK = 29
+
+def _tune_scheduling() -> None:
+    """
+    Reduce sleep jitter of the event loop thread on Linux by lowering
+    its timer slack and pinning it to a single CPU. SCHED_FIFO is also
+    requested if SARDINE_REALTIME=1 (needs CAP_SYS_NICE).
+    """
+    if not sys.platform.startswith("linux"):
+        return
+
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6")
+        libc.prctl(PR_SET_TIMERSLACK, 1, 0, 0, 0)
+    except (OSError, AttributeError):
+        pass
+
+    # Only affects the event loop thread, but threads and processes it
+    # starts later inherit it (sclang restores the full set of CPUs)
+    try:
+        os.sched_setaffinity(0, {min(os.sched_getaffinity(0))})
+    except OSError:
+        pass
+
+    if os.environ.get("SARDINE_REALTIME") == "1":
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(50))
+        except OSError as error:
+            print(f"[bold red]Could not use realtime scheduling: {error}[/bold red]")
+
+def boot() -> asyncio.Future:
+    """
+    Start the clock, print the banner and spawn SuperCollider. This
+    must be called from a running event loop (e.g. the asyncio REPL).
+
+    SuperCollider is spawned in a background thread while the clock
+    starts. The returned future can be awaited to get the process,
+    which is also stored in `SC` once ready.
+    """
+    start_default()
+
+    # Pretty printing
+    print(f"[red]{sardine}[/red]")
+    print_pre_alpha_todo()
+    print('\n')
+
+    # Should start, doesn't start
+    sc_future = asyncio.get_running_loop().run_in_executor(None, _spawn_sc)
+    sc_future.add_done_callback(_set_sc)
+
+    # After spawning SuperCollider's thread so that it isn't pinned too
+    _tune_scheduling()
+    return sc_future
 
 
 async def nap(duration):
     """ Musical sleep inside coroutines """
-    duration = c.tick_time + (duration * c.ppqn)
-    while c.tick_time < duration:
-        await asyncio.sleep(c._get_tick_duration() / c.ppqn)
+    target = c.tick_time + (duration * c.ppqn)
+    while c.tick_time < target:
+        await c.wait_tick()
 
 async def sync():
-    """ Manual resynchronisation """
+    """ Manual resynchronisation (waits for the start of the next bar) """
     cur_bar = c.elapsed_bars
-    while c.phase != 1 and c.elapsed_bars != cur_bar + 1:
-        await asyncio.sleep(c._get_tick_duration() / c.ppqn)
+    while c.elapsed_bars == cur_bar:
+        await c.wait_tick()
+
+
+def run(main: Union[Callable[[], Coroutine], None] = None) -> None:
+    """
+    Entrypoint for scripts: boot Sardine and run `main` (or run
+    forever if not given) on uvloop when it is available.
+    """
+    async def _main():
+        boot()
+        # Let the clock start before main() schedules anything
+        await asyncio.sleep(0)
+        if main is not None:
+            await main()
+        else:
+            await asyncio.Event().wait()
 
+    # The uvloop policy (if any) is already installed at import time
+    asyncio.run(_main())
 
-# Tests
-# =====
 
 def swim(fn):
     """ Push a function to the clock """
@@ -100,13 +212,3 @@ def die(fn):
     """ Remove a function from the clock """
     cr(fn)
     return fn
-
-@swim
-async def one(delay=1):
-    note(1, 60, 127, 1)
-    cs(one, delay=1)
-
-@swim
-async def two(delay=0.5):
-    note(1, 67, 127, 1)
-    cs(two, delay=0.5)
@@ -11,11 +11,36 @@ if TYPE_CHECKING:
 CoroFunc = Callable[..., Coroutine]
 
 
+def _check_delay(delay: float | int):
+    # A plain function never yields to the loop, so it would be
+    # called over and over within the same tick
+    if not delay > 0:
+        raise ValueError(f'delay must be positive, not {delay!r}')
+
+
 @dataclass
 class FunctionState:
     func: CoroFunc
     args: tuple
     kwargs: dict
+    # Introspected once per function rather than once per call
+    is_coroutine: bool = field(init=False)
+    default_delay: float | int = field(init=False)
+
+    def __post_init__(self):
+        self.is_coroutine = inspect.iscoroutinefunction(self.func)
+        try:
+            param = inspect.signature(self.func).parameters.get('delay')
+        except (TypeError, ValueError):
+            param = None
+        self.default_delay = getattr(param, 'default', 1)
+        if self.default_delay is inspect.Parameter.empty:
+            self.default_delay = 1
+        _check_delay(self.delay)
+
+    @property
+    def delay(self) -> float | int:
+        return self.kwargs.get('delay', self.default_delay)
 
 
 @dataclass
@@ -23,6 +48,10 @@ class AsyncRunner:
     """Handles calling synchronizing and running a function in
     the background, with support for run-time function patching.
 
+    Coroutine functions are awaited, plain functions are called
+    directly. Either way, the function is called every `delay`
+    beats until the runner is stopped.
+
     This class should only be used through a Clock instance via
     the `Clock.schedule()` method.
 
@@ -36,12 +65,17 @@ class AsyncRunner:
 
     def push(self, func: CoroFunc, *args, **kwargs):
         """Pushes a function state to the runner to be called in
-        the next iteration."""
+        the next iteration.
+
+        :raises ValueError: The function's delay is not positive.
+
+        """
         if not self.states or func is not self.states[-1].func:
             return self.states.append(FunctionState(func, args, kwargs))
 
         # patch the top-most state
         state = self.states[-1]
+        _check_delay(kwargs.get('delay', state.default_delay))
         state.args = args
         state.kwargs = kwargs
 
@@ -81,11 +115,14 @@ class AsyncRunner:
         self._stop = True
 
     async def _runner(self):
-        initial = True
         last_state = self.states[-1]
         name = last_state.func.__name__
         print(f'[yellow][Init {name}][/yellow]')
 
+        # Wait for the next beat then fire on a fixed grid of ticks
+        await self._wait(0)
+        next_time = self.clock.tick_time
+
         while self.states and not self._stop:
             # `state.func` must schedule itself to keep swimming
             self._swimming = False
@@ -97,19 +134,13 @@ class AsyncRunner:
                 print(f'[yellow][Reloaded {name}]' if pushed else f'[yellow][Restored {name}]')
                 last_state = state
 
-            # Introspect arguments to synchronize
-            if initial:
-                await self._wait(0)
-            else:
-                delay = state.kwargs.get('delay')
-                if delay is None:
-                    param = inspect.signature(state.func).parameters.get('delay')
-                    delay = getattr(param, 'default', 1)
-
-                await self._wait(delay)
+            await self._wait_until(next_time)
 
             try:
-                await state.func(*state.args, **state.kwargs)
+                if state.is_coroutine:
+                    await state.func(*state.args, **state.kwargs)
+                else:
+                    state.func(*state.args, **state.kwargs)
             except asyncio.CancelledError:
                 # assume the user has intentionally cancelled
                 return
@@ -119,11 +150,18 @@ class AsyncRunner:
 
                 self._revert_state()
 
-            initial = False
+            if not self.states:
+                break
+
+            # The function may have patched its delay while running.
+            # Don't try to catch up on iterations that took too long
+            delay = self.states[-1].delay
+            next_time = max(next_time + delay * self.clock.ppqn,
+                            self.clock.tick_time)
 
         # Remove from clock
         print(f'[yellow][Stopped {name}]')
-        self.clock.runners.pop(name)
+        self.clock._remove_runner(self)
 
     async def _wait(self, delay: float | int):
         clock = self.clock
@@ -131,16 +169,13 @@ class AsyncRunner:
         if delay == 0:
             cur_bar = clock.elapsed_bars
             while clock.phase != 1 and clock.elapsed_bars != cur_bar + 1:
-                await asyncio.sleep(self._wait_resolution)
+                await clock.wait_tick()
         else:
-            next_time = clock.get_tick_time() + delay * clock.ppqn
-            while clock.tick_time < next_time:
-                await asyncio.sleep(self._wait_resolution)
+            await self._wait_until(clock.get_tick_time() + delay * clock.ppqn)
 
-    @property
-    def _wait_resolution(self):
-        # Sleep resolution may be increased here
-        return self.clock._get_tick_duration() / (self.clock.ppqn * 2)
+    async def _wait_until(self, tick_time: float | int):
+        while self.clock.tick_time < tick_time:
+            await self.clock.wait_tick()
 
     def _revert_state(self):
         failed = self.states.pop()
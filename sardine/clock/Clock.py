@@ -1,13 +1,12 @@
 import asyncio
+import collections
 import inspect
-import itertools
 import mido
 from rich import print
-import time
 from typing import Callable, Coroutine, Union
 
 from .AsyncRunner import AsyncRunner
-from ..io.MidiIo import MIDIIo
+from ..io.MidiIo import MIDIIo, CLOCK_MSG, START_MSG, STOP_MSG
 
 # Aliases
 atask = asyncio.create_task
@@ -28,51 +27,70 @@ class Clock:
     beats_per_bar: int -- Number of beats in a given bar
     """
 
+    # Faster attribute access in the clock loop. New attributes must
+    # be declared here, they can't be added on the fly anymore.
+    __slots__ = (
+        '_midi', 'runners', '_by_name', 'running', '_debug', '_log_buf',
+        '_log_task', '_bpm', 'initial_time', 'delta', 'beat', 'ppqn',
+        'phase', 'beat_per_bar', 'current_beat', 'elapsed_bars',
+        'tick_duration', 'tick_time', '_tick_origin', '_tick_count',
+        '_tick_target', '_tick_event', 'lookahead', '_ramp_tables')
+
     def __init__(self, bpm: Union[float, int] = 120, beat_per_bar: int = 4):
 
         self._midi = MIDIIo()
         # Clock maintenance related
-        self.runners: dict[str, AsyncRunner] = {}
+        self.runners: dict[CoroFunc, AsyncRunner] = {}
+        self._by_name: dict[tuple[str, str], AsyncRunner] = {}
         self.running = False
         self._debug = False
+        self._log_buf: collections.deque = collections.deque(maxlen=4096)
+        self._log_task: asyncio.Task | None = None
         # Timing related
         self._bpm = bpm
         self.initial_time = 0
         self.delta = 0
         self.beat = -1
         self.ppqn = 48
-        self._phase_gen = itertools.cycle(range(1, self.ppqn + 1))
         self.phase = 0
         self.beat_per_bar = beat_per_bar
-        self._current_beat_gen = itertools.cycle(
-                range(1, self.beat_per_bar + 1))
         self.current_beat = 0
         self.elapsed_bars = 0
-        self.tick_duration = self._get_tick_duration()
+        self._update_tick_duration()
         self.tick_time = 0
+        self._tick_origin = 0.0
+        self._tick_count = 0
+        # Ideal (jitter-free) time of the current tick, in loop time
+        self._tick_target = 0.0
+        self._tick_event = asyncio.Event()
+        # MIDI output scheduling
+        self.lookahead = 0.010
+        # Precomputed ramp values for each phase, see `ramp` and `iramp`
+        self._ramp_tables: dict[tuple, list[int]] = {}
 
     def init_reset(self,
-            runners: dict[str, AsyncRunner],
+            runners: dict[CoroFunc, AsyncRunner],
             bpm: Union[float, int],
             midi: MIDIIo,
             beat_per_bar: int):
         self._midi = midi
-        self.runners: dict[str, AsyncRunner] = {}
+        self.runners: dict[CoroFunc, AsyncRunner] = {}
+        self._by_name: dict[tuple[str, str], AsyncRunner] = {}
         self._debug = False
         self._bpm = bpm
         self.initial_time = 0
         self.delta = 0
         # self.beat = -1
         self.ppqn = 48
-        self._phase_gen = itertools.cycle(range(1, self.ppqn + 1))
         self.phase = 0
         self.beat_per_bar = beat_per_bar
-        self._current_beat_gen = itertools.cycle(
-                range(1, self.beat_per_bar + 1))
         self.current_beat = 0
         self.elapsed_bars = 0
-        self.tick_duration = self._get_tick_duration()
+        self._update_tick_duration()
         self.tick_time = 0
+        self._tick_origin = 0.0
+        self._tick_count = 0
+        self._tick_target = 0.0
 
     # ---------------------------------------------------------------------- #
     # Setters and getters
@@ -84,15 +102,24 @@ class Clock:
     def set_bpm(self, new_bpm: int) -> None:
         """ BPM Setter """
         if 1 < new_bpm < 800:
+            if self.running:
+                # Re-anchor on the pending tick so that the next one
+                # lands exactly one (new) tick after it
+                self._tick_origin += self._tick_count * self.tick_duration
+                self._tick_count = 0
             self._bpm = new_bpm
-            self.tick_duration = self._get_tick_duration()
+            self._update_tick_duration()
 
     def get_debug(self):
         """ Debug getter """
         return self._debug
 
     def set_debug(self, boolean: bool):
-        """ Debug setter """
+        """ Debug setter, must be called from within the running loop """
+        # Start the drain first: outside of a running loop create_task
+        # raises, and debug must not be left on with nothing to drain it
+        if boolean and self._log_task is None:
+            self._log_task = asyncio.create_task(self._log_drain())
         self._debug = boolean
 
     bpm = property(get_bpm, set_bpm)
@@ -101,42 +128,95 @@ class Clock:
     # ---------------------------------------------------------------------- #
     # Private methods
 
+    def _update_tick_duration(self) -> None:
+        """ Cache the duration of a tick, it only changes with the BPM """
+        self.tick_duration = (60 / self._bpm) / self.ppqn
+
     def _get_tick_duration(self):
-        return ((60 / self.bpm) / self.ppqn) - self.delta
+        return self.tick_duration
+
+    def _schedule_midi(self, message: mido.Message, when: float) -> None:
+        """
+        Queue a MIDI message to be sent by the MIDI worker. The message
+        will leave `lookahead` seconds after `when` (event loop time),
+        usually derived from `_tick_target` rather than the current time.
+        """
+        self._midi.schedule(message, when + self.lookahead)
 
     def _update_phase(self) -> None:
         """ Update the current phase in MIDI Clock """
-        self.phase = next(self._phase_gen)
+        self.phase = self.phase % self.ppqn + 1
 
     def _update_current_beat(self) -> None:
         """ Update the current beat in bar """
-        self.current_beat = next(self._current_beat_gen)
+        self.current_beat = self.current_beat % self.beat_per_bar + 1
 
     # ---------------------------------------------------------------------- #
     # Scheduler methods
 
     def schedule(self, func: CoroFunc, /, *args, **kwargs):
-        """Schedules the given function to be executed."""
-        if not inspect.iscoroutinefunction(func):
-            raise TypeError(f'func must be a coroutine function, not {type(func).__name__}')
-        elif not self.running:
+        """Schedules the given function (coroutine or plain) to be executed."""
+        if not self.running:
             raise RuntimeError(f"Clock must be started before functions can be scheduled")
 
-        name = func.__name__
-        runner = self.runners.get(name)
+        runner = self.runners.get(func)
         if runner is None:
-            runner = self.runners[name] = AsyncRunner(self)
+            # Functions with a runner were already checked, which keeps
+            # the check out of recursive calls
+            # Runners need a name, a signature and globals to patch,
+            # which partials and other callables don't all provide
+            if not (inspect.isfunction(func) or inspect.ismethod(func)):
+                raise TypeError(f'func must be a function, not {type(func).__name__}')
+
+            # A function redefined in the REPL patches its previous runner
+            key = self._reload_key(func)
+            runner = self._by_name.get(key) if key is not None else None
+            if runner is None:
+                runner = AsyncRunner(self)
+            # Push before registering so a rejected call leaves no runner
+            runner.push(func, *args, **kwargs)
+            if key is not None:
+                self._by_name[key] = runner
+            self.runners[func] = runner
+        else:
+            runner.push(func, *args, **kwargs)
 
-        runner.push(func, *args, **kwargs)
         if not runner.started():
             runner.start()
 
+    @staticmethod
+    def _reload_key(func: CoroFunc) -> tuple[str, str] | None:
+        """
+        Key identifying a function across redefinitions, or None for
+        lambdas, closures and bound methods, which can share a name
+        without being the same function.
+        """
+        if inspect.ismethod(func):
+            return None
+        qualname = func.__qualname__
+        if '<lambda>' in qualname or '<locals>' in qualname:
+            return None
+        return (func.__module__, qualname)
+
+    def _remove_runner(self, runner: AsyncRunner) -> None:
+        """ Forget a runner that has stopped """
+        for func in [f for f, r in self.runners.items() if r is runner]:
+            del self.runners[func]
+        for key in [k for k, r in self._by_name.items() if r is runner]:
+            del self._by_name[key]
+
     # ---------------------------------------------------------------------- #
     # Public methods
 
     def remove(self, func: CoroFunc, /):
         """Schedules the given function to stop execution."""
-        runner = self.runners[func.__name__]
+        runner = self.runners.get(func)
+        if runner is None:
+            # Also works with the redefinition of a scheduled function
+            key = self._reload_key(func)
+            if key not in self._by_name:
+                raise KeyError(func)
+            runner = self._by_name[key]
         runner.stop()
 
     def get_phase(self):
@@ -144,15 +224,17 @@ class Clock:
 
     def print_children(self):
         """ Print all children on clock """
-        [print(child) for child in self.runners]
+        # A runner can be reached from several redefinitions, show the latest
+        names = {id(runner): func.__name__ for func, runner in self.runners.items()}
+        [print(name) for name in names.values()]
 
     def ticks_to_next_bar(self) -> None:
         """ How many ticks until next bar? """
-        return (self.ppqn - self.phase - 1) * self._get_tick_duration()
+        return (self.ppqn - self.phase - 1) * self.tick_duration
 
-    async def play_note(self, note: int = 60, channel: int = 0,
-                        velocity: int = 127,
-                        duration: Union[float, int] = 1) -> None:
+    def play_note(self, note: int = 60, channel: int = 0,
+                  velocity: int = 127,
+                  duration: Union[float, int] = 1) -> None:
 
         """
         OBSOLETE // Was used to test things but should be removed.
@@ -165,15 +247,11 @@ class Clock:
         velocity: int -- MIDI velocity (default 127)
         """
 
-        async def send_something(message):
-            """ inner non blocking function """
-            asyncio.create_task(self._midi.send_async(message))
-
+        now = self._tick_target
         note_on = mido.Message('note_on', note=note, channel=channel, velocity=velocity)
         note_off = mido.Message('note_off', note=note, channel=channel, velocity=velocity)
-        await send_something(note_on)
-        await asyncio.sleep(self.tick_duration * duration)
-        await send_something(note_off)
+        self._schedule_midi(note_on, now)
+        self._schedule_midi(note_off, now + max(0, self.tick_duration * duration))
 
     async def run_clock_initial(self):
         """ The MIDIClock needs to start """
@@ -205,7 +283,7 @@ class Clock:
 
         self.running = False
         self._midi.send_stop()
-        self._midi.send(mido.Message('stop'))
+        self._midi.send(STOP_MSG)
         self.init_reset(
                 runners=self.runners,
                 bpm=self._bpm,
@@ -214,8 +292,9 @@ class Clock:
 
     async def _send_start(self, initial: bool = False) -> None:
         """ MIDI Start message """
-        self._midi.send(mido.Message('start'))
+        self._midi.send(START_MSG)
         self.running = True
+        self._midi.start_pump()
         if initial:
             asyncio.create_task(self.run_clock())
 
@@ -226,68 +305,112 @@ class Clock:
     def log(self) -> None:
 
         """
-        Pretty print information about Clock timing on the console.
-        Used for debugging purposes. Not to be used when playing,
-        can be very verbose. Will overflow the console in no-time.
+        Record information about Clock timing, printed on the console
+        by `_log_drain` outside of the clock loop. Used for debugging
+        purposes. Very verbose, will overflow the console in no-time.
         """
 
-        color = "[bold red]" if self.phase == 1 else "[bold yellow]"
-        first = color + f"BPM: {self.bpm}, PHASE: {self.phase:02}, DELTA: {self.delta:2f}"
-        second = color + f" || [{self.tick_time}] {self.current_beat}/{self.beat_per_bar}"
-        print(first + second)
+        self._log_buf.append((self.tick_time, self.phase, self.delta,
+                              self._bpm, self.current_beat))
+
+    async def _log_drain(self) -> None:
+        """ Pretty print the records made by `log` every 100ms """
+        while self._debug or self._log_buf:
+            await asyncio.sleep(0.1)
+            records = list(self._log_buf)
+            self._log_buf.clear()
+            for tick_time, phase, delta, bpm, current_beat in records:
+                color = "[bold red]" if phase == 1 else "[bold yellow]"
+                first = color + f"BPM: {bpm}, PHASE: {phase:02}, DELTA: {delta:2f}"
+                second = color + f" || [{tick_time}] {current_beat}/{self.beat_per_bar}"
+                print(first + second)
+        self._log_task = None
 
 
     async def run_clock(self):
 
         """
-        Main Method for the MIDI Clock. Full of errors and things that
-        msut be fixed. Drift can happen, and it might need a full rewrite.
+        Main Method for the MIDI Clock. Every tick is scheduled against
+        a fixed origin (start + n * tick_duration) rather than relative
+        to the previous one, so that sleep jitter doesn't accumulate.
 
         Keyword arguments:
         debug: bool -- print debug messages on stdout.
         """
 
-        async def _clock_update():
-            """ Things the clock should do every tick """
-
-            self.tick_duration = self._get_tick_duration()
-
-            begin = time.perf_counter()
-            self.delta = 0
-
-            await asyncio.sleep(self.tick_duration)
+        loop = asyncio.get_running_loop()
+        self._tick_origin = self._tick_target = loop.time()
+        self._tick_count = 0
 
-            # test to get right tempo
-            if self.phase % 2 == 0:
-                asyncio.create_task(self._midi.send_clock_async())
+        while self.running:
+            # Sleep until an absolute target so that errors never accumulate,
+            # waking up early by the usual lateness of the event loop
+            self._tick_count += 1
+            target = self._tick_origin + self._tick_count * self.tick_duration
+            wake = target - self.delta
+            sleep_for = wake - loop.time()
+            if sleep_for > 0:
+                await asyncio.sleep(sleep_for)
+
+                # Clamped and low-pass filtered, a single late tick (GC
+                # pause, busy loop...) can't drag the following ones along
+                limit = 0.5 * self.tick_duration
+                late = max(-limit, min(limit, loop.time() - wake))
+                self.delta = 0.7 * self.delta + 0.3 * late
+            else:
+                # Catching up after a stall: this measures the backlog,
+                # not the wake-up latency, so it isn't sampled
+                await asyncio.sleep(0)
+
+            # MIDI events of this tick are timestamped from its target
+            self._tick_target = target
 
             # Time grains
             self.tick_time += 1
             self._update_phase()
 
-            # XPPQN = 1 Beat
+            # XPPQN = 1 Beat
             if self.phase == 1:
                 self._update_current_beat()
-            if self.phase == 1 and self.current_beat == 1:
-                self.elapsed_bars += 1
+                self.elapsed_bars += self.current_beat == 1
+
+            # MIDI Clock is 24 PPQN: every other tick (odd ticks,
+            # which used to be the ones starting on an even phase)
+            if self.tick_time & 1:
+                self._schedule_midi(CLOCK_MSG, target)
 
-            # End of it
-            end = time.perf_counter()
-            self.delta = end - begin - self.tick_duration
             if self._debug:
                 self.log()
 
-        while self.running:
-            await _clock_update()
+            # Wake up everything waiting for the next tick
+            self._tick_event.set()
+            self._tick_event.clear()
 
     def get_tick_time(self):
         """ Indirection to get tick time """
         return self.tick_time
 
+    async def wait_tick(self) -> None:
+        """ Wait until the clock moves to the next tick """
+        await self._tick_event.wait()
+
+    def _ramp_table(self, min: int, max: int, inverted: bool) -> list[int]:
+        """ Ramp values for every phase, built on first use """
+        key = (min, max, inverted, self.ppqn)
+        table = self._ramp_tables.get(key)
+        if table is None:
+            span = max - min + 1
+            if inverted:
+                table = [self.ppqn - i % span + min for i in range(self.ppqn + 1)]
+            else:
+                table = [i % span + min for i in range(self.ppqn + 1)]
+            self._ramp_tables[key] = table
+        return table
+
     def ramp(self, min: int, max: int):
         """ Generate a ramp between min and max using phase """
-        return self.phase % (max - min + 1) + min
+        return self._ramp_table(min, max, False)[self.phase]
 
     def iramp(self, min: int, max: int):
         """ Generate an inverted ramp between min and max using phase"""
-        return self.ppqn - self.phase % (max - min + 1) + min
+        return self._ramp_table(min, max, True)[self.phase]
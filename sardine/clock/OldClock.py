@@ -339,7 +339,7 @@ class Clock:
             self.delta = 0
 
             await asyncio.sleep(self.tick_duration)
-            asyncio.create_task(self._midi.send_clock_async())
+            self._midi.send_clock()
 
             # Time grains
             self.tick_time += 1
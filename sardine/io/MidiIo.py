@@ -1,3 +1,4 @@
+import itertools
 import mido
 import threading
 from typing import Union
@@ -5,6 +6,12 @@ from rich.console import Console
 from rich import print
 import asyncio
 
+# Realtime messages are sent often and never change, build them once
+CLOCK_MSG = mido.Message('clock')
+START_MSG = mido.Message('start')
+STOP_MSG = mido.Message('stop')
+
+
 class MIDIIo(threading.Thread):
 
     """
@@ -26,6 +33,11 @@ class MIDIIo(threading.Thread):
                 self._midi = mido.open_output(self.choose_midi_port())
             except Exception as error:
                 print(f"[bold red]Init error: {error}[/bold red]")
+        # Timestamped output queue, drained by a single worker task
+        self._midi_queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._queue_count = itertools.count()
+        self._queue_wakeup = asyncio.Event()
+        self._pump_task: Union[asyncio.Task, None] = None
 
     def choose_midi_port(self) -> str:
         """ ASCII MIDI Port chooser """
@@ -45,12 +57,41 @@ class MIDIIo(threading.Thread):
     def send(self, message: mido.Message) -> None:
         self._midi.send(message)
 
+    def schedule(self, message: mido.Message, timestamp: float) -> None:
+        """ Queue a message to be sent at a given event loop time """
+        # The counter keeps messages sharing a timestamp in order
+        self._midi_queue.put_nowait(
+                (timestamp, next(self._queue_count), message))
+        self._queue_wakeup.set()
+
+    def start_pump(self) -> None:
+        """ Start the worker sending queued messages (only once) """
+        if self._pump_task is None:
+            self._pump_task = asyncio.create_task(self._pump())
+
+    async def _pump(self) -> None:
+        """ Send queued messages when their timestamp is reached """
+        loop = asyncio.get_running_loop()
+        while True:
+            timestamp, count, message = await self._midi_queue.get()
+            delay = timestamp - loop.time()
+            if delay > 0:
+                self._queue_wakeup.clear()
+                timer = loop.call_later(delay, self._queue_wakeup.set)
+                await self._queue_wakeup.wait()
+                timer.cancel()
+                if not self._midi_queue.empty():
+                    # Something was queued meanwhile and might come first
+                    self._midi_queue.put_nowait((timestamp, count, message))
+                    continue
+            self._midi.send(message)
+
     async def send_async(self, message: mido.Message) -> None:
         self._midi.send(message)
 
     def send_stop(self) -> None:
         """ MIDI Start message """
-        self._midi.send(mido.Message('stop'))
+        self._midi.send(STOP_MSG)
 
     def send_reset(self) -> None:
         """ MIDI Reset message """
@@ -59,17 +100,13 @@ class MIDIIo(threading.Thread):
 
     def send_clock(self) -> None:
         """ MIDI Clock Message """
-        self._midi.send(mido.Message('clock'))
-
-    async def send_clock_async(self) -> None:
-        """ MIDI Clock Message """
-        self._midi.send(mido.Message('clock'))
+        self._midi.send(CLOCK_MSG)
 
     async def send_start(self, initial: bool = False) -> None:
         """ MIDI Start message """
-        self._midi.send(mido.Message('start'))
+        self._midi.send(START_MSG)
 
-    async def note(self, clock, delay: Union[int, float],
+    def note(self, clock, delay: Union[int, float],
             note:int = 60, velocity: int = 127, channel:int = 1) -> None:
         """ Double message: noteon and noteoff """
         noteon = mido.Message('note_on',
@@ -77,15 +114,15 @@ class MIDIIo(threading.Thread):
         noteoff = mido.Message('note_off',
                 note=note, velocity=velocity, channel=channel)
 
-        self._midi.send(noteon)
-        let_it_die = 1 # we need to keep some time to let the note die
-        duration = clock.tick_time + ((delay * clock.ppqn) - let_it_die)
-        while clock.tick_time < duration:
-            # Increased temporal resolution for midi messages
-            await asyncio.sleep(clock._get_tick_duration() / (clock.ppqn * 2))
-        self._midi.send(noteoff)
+        now = clock._tick_target
+        let_it_die = 1 # we need to keep some time to let the note die
+        # Never before note_on, equal timestamps keep their queue order
+        duration = max(0, ((delay * clock.ppqn) - let_it_die) * clock.tick_duration)
+        clock._schedule_midi(noteon, now)
+        clock._schedule_midi(noteoff, now + duration)
 
-    async def control_change(self, channel, control, value) -> None:
+    def control_change(self, clock, channel, control, value) -> None:
         """ Control Change message """
-        self._midi.send(mido.Message('control_change',
-            channel=channel, control=control, value=value))
+        clock._schedule_midi(mido.Message('control_change',
+            channel=channel, control=control, value=value),
+            clock._tick_target)
@@ -6,6 +6,14 @@ from os import walk
 from rich import print
 from typing import Union
 
+# CPUs available at import, before boot() pins the clock thread to one
+_AFFINITY = os.sched_getaffinity(0) if hasattr(os, "sched_getaffinity") else None
+
+def _restore_affinity(pid: int) -> None:
+    """ Let sclang use every CPU, even when spawned from the clock thread """
+    if _AFFINITY:
+        os.sched_setaffinity(pid, _AFFINITY)
+
 
 def find_startup_file():
     """ Find the startup file when booting Sardine """
@@ -40,6 +48,7 @@ class SuperColliderProcess():
             bufsize=1,
             universal_newlines=True,
             start_new_session=True)
+        _restore_affinity(self._sclang_proc.pid)
 
 
     def terminate(self) -> None:
@@ -67,6 +76,7 @@ class SuperColliderProcess():
             bufsize=1,
             universal_newlines=True,
             start_new_session=True)
+        _restore_affinity(self._sclang_proc.pid)
 
     def hard_reset(self) -> None:
 